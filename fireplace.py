@@ -1,17 +1,59 @@
 #!/usr/bin/env python3
 import argparse
+import atexit
 import os
 import signal
 import sys
+import threading
 import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Optional
 
 
-_COLOR_MODE: str = os.getenv("FIREPLACE_COLOR", "auto")
+_TRUTHY = frozenset({"1", "true", "yes", "y"})
+_DUMB_TERMS = frozenset({"", "dumb"})
+
+
+@dataclass(frozen=True)
+class _Env:
+    main_relay: Optional[str]
+    high_relay: Optional[str]
+    pin_main: Optional[str]
+    pin_high: Optional[str]
+    active_low: bool
+    color: str
+    pin_factory: Optional[str]
+
+
+# FIREPLACE_* settings, read once at import.
+_ENV = _Env(
+    main_relay=os.getenv("FIREPLACE_MAIN_RELAY"),
+    high_relay=os.getenv("FIREPLACE_HIGH_RELAY"),
+    pin_main=os.getenv("FIREPLACE_PIN_MAIN"),
+    pin_high=os.getenv("FIREPLACE_PIN_HIGH"),
+    active_low=os.getenv("FIREPLACE_ACTIVE_LOW", "").strip().lower() in _TRUTHY,
+    color=os.getenv("FIREPLACE_COLOR", "auto"),
+    pin_factory=os.getenv("FIREPLACE_PIN_FACTORY"),
+)
+
+_COLOR_MODE: str = _ENV.color
+# Resolved _use_color() result; reset via _invalidate_color_cache() when _COLOR_MODE changes.
+_COLOR_CACHE: Optional[bool] = None
+
+
+def _invalidate_color_cache() -> None:
+    global _COLOR_CACHE
+    _COLOR_CACHE = None
 
 
 def _use_color() -> bool:
+    global _COLOR_CACHE
+    if _COLOR_CACHE is None:
+        _COLOR_CACHE = _compute_use_color()
+    return _COLOR_CACHE
+
+
+def _compute_use_color() -> bool:
     mode = (_COLOR_MODE or "auto").strip().lower()
     if mode == "never":
         return False
@@ -24,7 +66,7 @@ def _use_color() -> bool:
     if not sys.stdout.isatty():
         return False
     term = (os.getenv("TERM") or "").strip().lower()
-    if term in {"", "dumb"}:
+    if term in _DUMB_TERMS:
         return False
     return True
 
@@ -52,13 +94,51 @@ def _read_uptime_seconds() -> Optional[float]:
         return None
 
 
-def _sleep_with_sigint(seconds: float) -> None:
-    end = time.monotonic() + max(0.0, seconds)
+_SLEEP_CHUNK_SECONDS = 3600.0
+
+
+def _sleep_with_sigint(seconds: float, *, cancel: Optional[threading.Event] = None) -> None:
+    # In-process callers (web UI) cancel via the event instead of SIGINT.
+    seconds = max(0.0, seconds)
+    if seconds <= _SLEEP_CHUNK_SECONDS:
+        # One sleep: SIGINT interrupts it and the handler raises KeyboardInterrupt.
+        if cancel is not None:
+            cancel.wait(seconds)
+        else:
+            time.sleep(seconds)
+        return
+
+    # Very long waits re-check the deadline between chunks (also keeps Event.wait
+    # below threading.TIMEOUT_MAX).
+    end = time.monotonic() + seconds
     while True:
         remaining = end - time.monotonic()
         if remaining <= 0:
             return
-        time.sleep(min(0.2, remaining))
+        chunk = min(_SLEEP_CHUNK_SECONDS, remaining)
+        if cancel is not None:
+            if cancel.wait(chunk):
+                return
+        else:
+            time.sleep(chunk)
+
+
+_RELEASE_SIGNALS = frozenset({signal.SIGINT, signal.SIGTERM})
+
+
+def _wait_for_release_signal() -> None:
+    # Block in the kernel (no wakeups) until Ctrl+C or SIGTERM (e.g. the web UI's Stop), then
+    # return normally so the caller OPENs the relay. Signals are only blocked for this wait,
+    # so Ctrl+C during timed sleeps still raises KeyboardInterrupt.
+    if not hasattr(signal, "sigwait"):
+        while True:
+            time.sleep(1)
+
+    previous = signal.pthread_sigmask(signal.SIG_BLOCK, _RELEASE_SIGNALS)
+    try:
+        signal.sigwait(_RELEASE_SIGNALS)
+    finally:
+        signal.pthread_sigmask(signal.SIG_SETMASK, previous)
 
 
 @dataclass(frozen=True)
@@ -88,6 +168,9 @@ KNOWN_RELAYS: dict[str, int] = {
     "aux_2": 26,
 }
 
+_PIN_TO_NAME: dict[int, str] = {pin: name for name, pin in KNOWN_RELAYS.items()}
+_KNOWN_NAMES_SORTED: tuple[str, ...] = tuple(sorted(KNOWN_RELAYS))
+
 PHYSICAL_RELAY_NOTES: dict[str, str] = {
     "low_flame": "physical relay #1 (furthest from USB ports)",
     "high_flame": "physical relay #2 (next closer to USB ports)",
@@ -116,12 +199,15 @@ RELAY_ALIASES: dict[str, str] = {
     "r26": "aux_2",
 }
 
+# Every canonical name and alias -> BCM pin, so resolution is a single lookup.
+_RESOLVE: dict[str, int] = {
+    **KNOWN_RELAYS,
+    **{alias: KNOWN_RELAYS[canon] for alias, canon in RELAY_ALIASES.items()},
+}
+
 
 def _relay_name_for_pin(pin: int) -> str:
-    for name, p in KNOWN_RELAYS.items():
-        if p == pin:
-            return name
-    return f"gpio{pin}"
+    return _PIN_TO_NAME.get(pin) or f"gpio{pin}"
 
 
 def _resolve_relay_ref(value: Optional[str | int]) -> Optional[int]:
@@ -136,56 +222,202 @@ def _resolve_relay_ref(value: Optional[str | int]) -> Optional[int]:
     if not s:
         return None
 
-    if s in RELAY_ALIASES:
-        s = RELAY_ALIASES[s]
-
-    if s in KNOWN_RELAYS:
-        return KNOWN_RELAYS[s]
+    pin = _RESOLVE.get(s)
+    if pin is not None:
+        return pin
 
     try:
         return int(s)
     except ValueError as e:
         raise SystemExit(
-            f"Unknown relay '{s}'. Use one of: {', '.join(sorted(KNOWN_RELAYS.keys()))} (or a BCM pin number)"
+            f"Unknown relay '{s}'. Use one of: {', '.join(_KNOWN_NAMES_SORTED)} (or a BCM pin number)"
         ) from e
 
 
+# gpiozero's OutputDevice, imported once on first real-GPIO use. Kept lazy so
+# --dry-run, list-relays and the web UI don't pay gpiozero's import cost.
+_OutputDevice = None
+
+
+def _load_output_device():
+    global _OutputDevice
+    if _OutputDevice is None:
+        try:
+            from gpiozero import OutputDevice  # type: ignore
+        except Exception as e:
+            raise RuntimeError(
+                "gpiozero is required on the Pi (sudo apt install python3-gpiozero), or use --dry-run"
+            ) from e
+        _OutputDevice = OutputDevice
+        # Registered after gpiozero's own atexit hook so it runs first (LIFO), while devices are still open.
+        atexit.register(_open_live_relays)
+    return _OutputDevice
+
+
+# Real-GPIO relays that have not been release()d. OPENed at interpreter exit, which also
+# covers SIGTERM (the CLI maps it to SystemExit) so a terminated hold never stays energized.
+_LIVE_RELAYS: set["Relay"] = set()
+
+
+def _open_live_relays() -> None:
+    for relay in list(_LIVE_RELAYS):
+        try:
+            relay.open(force=True)
+        except Exception:
+            pass
+
+
+# C-backed gpiozero pin factories, selectable with --pin-factory for tighter edge timing
+# than gpiozero's default fallback chain. Name -> (module, class).
+PIN_FACTORIES: dict[str, tuple[str, str]] = {
+    "lgpio": ("gpiozero.pins.lgpio", "LGPIOFactory"),
+    "pigpio": ("gpiozero.pins.pigpio", "PiGPIOFactory"),
+    "rpigpio": ("gpiozero.pins.rpigpio", "RPiGPIOFactory"),
+}
+
+_PIN_FACTORY_ACTIVE: Optional[str] = None
+
+
+def _use_pin_factory(name: Optional[str]) -> None:
+    # Must run before the first OutputDevice is created; repeat calls with the same name are no-ops.
+    global _PIN_FACTORY_ACTIVE
+    if not name or name == _PIN_FACTORY_ACTIVE:
+        return
+    if name not in PIN_FACTORIES:
+        raise ValueError(f"Unknown pin factory '{name}'. Use one of: {', '.join(PIN_FACTORIES)}")
+
+    module_name, class_name = PIN_FACTORIES[name]
+    try:
+        import importlib
+
+        from gpiozero import Device  # type: ignore
+
+        factory_cls = getattr(importlib.import_module(module_name), class_name)
+        Device.pin_factory = factory_cls()
+    except Exception as e:
+        raise RuntimeError(f"gpiozero pin factory '{name}' is unavailable: {e}") from e
+    _PIN_FACTORY_ACTIVE = name
+
+
 class Relay:
     def __init__(self, cfg: RelayConfig, *, dry_run: bool) -> None:
         self._cfg = cfg
         self._dry_run = dry_run
         self._dev = None
+        # Last state written (True = CLOSED). None until the first write, so the first
+        # open()/close() always reaches the pin; repeats of the same state are skipped.
+        self._last_state: Optional[bool] = None
 
         if not dry_run:
-            try:
-                from gpiozero import OutputDevice  # type: ignore
-            except Exception as e:
-                raise RuntimeError(
-                    "gpiozero is required on the Pi (sudo apt install python3-gpiozero), or use --dry-run"
-                ) from e
+            output_device = _load_output_device()
 
             # Relay hats are often active-low. `active_high` means: drive pin high to turn ON.
             active_high = not cfg.active_low
-            self._dev = OutputDevice(cfg.pin, active_high=active_high, initial_value=False)
+            self._dev = output_device(cfg.pin, active_high=active_high, initial_value=False)
+            _LIVE_RELAYS.add(self)
 
-    def open(self) -> None:
+    def open(self, *, force: bool = False) -> None:
+        # `force` rewrites the pin even if it should already be OPEN (fail-safe paths).
+        if self._last_state is False and not force:
+            return
         if self._dry_run:
             name = _relay_name_for_pin(self._cfg.pin)
             print(f"[dry-run] relay(pin={self._cfg.pin} name={name}) -> {_red('OPEN-DEACTIVATE')}")
-            return
-        assert self._dev is not None
-        self._dev.off()
+        else:
+            assert self._dev is not None
+            self._dev.off()
+        # Only after the write succeeded: a failed write must not make later open() calls no-ops.
+        self._last_state = False
 
     def close(self) -> None:
+        if self._last_state is True:
+            return
         if self._dry_run:
             name = _relay_name_for_pin(self._cfg.pin)
             print(f"[dry-run] relay(pin={self._cfg.pin} name={name}) -> {_green('CLOSE-ACTIVATE')}")
+        else:
+            assert self._dev is not None
+            self._dev.on()
+        self._last_state = True
+
+    def release(self) -> None:
+        """OPEN the relay and free the GPIO pin so another Relay can claim it."""
+        self.open(force=True)
+        _LIVE_RELAYS.discard(self)
+        if self._dev is not None:
+            self._dev.close()
+            self._dev = None
+        self._last_state = None
+
+
+GPIOCHIP_PATH = "/dev/gpiochip0"
+
+
+class GpiodRelayBank:
+    """Several relay pins on one libgpiod (v1 API) line request.
+
+    Every edge is a single set_values() call covering all pins, instead of one
+    OutputDevice write per pin. Values are logical: 1 = CLOSED (active_low is
+    handled by the line request flags).
+    """
+
+    def __init__(self, pins: list[int], *, active_low: bool, dry_run: bool, chip_path: str = GPIOCHIP_PATH) -> None:
+        self._pins = list(pins)
+        self._dry_run = dry_run
+        self._chip = None
+        self._lines = None
+
+        if not dry_run:
+            try:
+                import gpiod  # type: ignore
+            except Exception as e:
+                raise RuntimeError(
+                    "python3-libgpiod is required for --batch (sudo apt install python3-libgpiod), or omit --batch"
+                ) from e
+            # libgpiod v2's binding dropped Chip.get_lines / LINE_REQ_* in favour of request_lines().
+            if not hasattr(gpiod, "LINE_REQ_DIR_OUT") or not hasattr(gpiod.Chip, "get_lines"):
+                raise RuntimeError(
+                    "--batch needs the libgpiod v1 Python binding (python3-libgpiod < 2.0), or omit --batch"
+                )
+
+            self._chip = gpiod.Chip(chip_path)
+            self._lines = self._chip.get_lines(self._pins)
+            self._lines.request(
+                consumer="fireplace-probe",
+                type=gpiod.LINE_REQ_DIR_OUT,
+                flags=gpiod.LINE_REQ_FLAG_ACTIVE_LOW if active_low else 0,
+                default_vals=[0] * len(self._pins),
+            )
+
+    def _write(self, values: list[int]) -> None:
+        if self._dry_run:
+            states = ", ".join(
+                f"{pin}={_green('CLOSE') if v else _red('OPEN')}" for pin, v in zip(self._pins, values)
+            )
+            print(f"[dry-run] relays({states})")
             return
-        assert self._dev is not None
-        self._dev.on()
+        assert self._lines is not None
+        self._lines.set_values(values)
+
+    def open(self) -> None:
+        self._write([0] * len(self._pins))
 
+    def close_only(self, pin: int) -> None:
+        self._write([1 if p == pin else 0 for p in self._pins])
 
-def _guard_after_boot(min_uptime_seconds: float, *, dry_run: bool) -> None:
+    def release(self) -> None:
+        self.open()
+        if self._lines is not None:
+            self._lines.release()
+            self._lines = None
+        if self._chip is not None:
+            self._chip.close()
+            self._chip = None
+
+
+def _guard_after_boot(
+    min_uptime_seconds: float, *, dry_run: bool, cancel: Optional[threading.Event] = None
+) -> None:
     if min_uptime_seconds <= 0:
         return
 
@@ -198,24 +430,33 @@ def _guard_after_boot(min_uptime_seconds: float, *, dry_run: bool) -> None:
     remaining = min_uptime_seconds - uptime
     if remaining > 0:
         print(f"Boot guard: waiting {remaining:.1f}s to avoid IPI detection window")
-        _sleep_with_sigint(remaining)
+        _sleep_with_sigint(remaining, cancel=cancel)
 
 
-def cmd_pulse(relay: Relay, *, pulse_ms: int) -> None:
-    relay.open()
+def cmd_pulse(relay: Relay, *, pulse_ms: int, cancel: Optional[threading.Event] = None) -> None:
+    # Callers OPEN the relay first (main's fail-safe), so go straight to the edge.
     relay.close()
-    _sleep_with_sigint(pulse_ms / 1000.0)
-    relay.open()
+    try:
+        _sleep_with_sigint(pulse_ms / 1000.0, cancel=cancel)
+    finally:
+        relay.open()
 
 
-def cmd_hold(relay: Relay, *, hold_seconds: Optional[float]) -> None:
+def cmd_hold(
+    relay: Relay, *, hold_seconds: Optional[float], cancel: Optional[threading.Event] = None
+) -> None:
     relay.open()
     relay.close()
-    if hold_seconds is None:
+    if cancel is not None:
+        # In-process callers release early by setting the event (None = until set).
+        if hold_seconds is None:
+            cancel.wait()
+        else:
+            _sleep_with_sigint(hold_seconds, cancel=cancel)
+    elif hold_seconds is None:
         print("Holding relay closed; Ctrl+C to release")
         try:
-            while True:
-                time.sleep(1)
+            _wait_for_release_signal()
         except KeyboardInterrupt:
             pass
     else:
@@ -242,8 +483,7 @@ def cmd_maintained(relay: Relay, *, hold_seconds: Optional[float]) -> None:
     if hold_seconds is None:
         print("Maintained call active; Ctrl+C to shut down")
         try:
-            while True:
-                time.sleep(1)
+            _wait_for_release_signal()
         except KeyboardInterrupt:
             pass
     else:
@@ -251,41 +491,95 @@ def cmd_maintained(relay: Relay, *, hold_seconds: Optional[float]) -> None:
     relay.open()
 
 
-def cmd_probe(
-    *,
+def _run_probe_sequence(
     pins: list[int],
-    active_low: bool,
+    *,
+    open_pin: Callable[[int], None],
+    close_pin: Callable[[int], None],
     pulse_ms: int,
     open_seconds: float,
     close_seconds: Optional[float],
     post_open_seconds: float,
-    dry_run: bool,
 ) -> None:
-    if not pins:
-        raise SystemExit("probe requires at least one pin")
+    # Shared by cmd_probe / cmd_probe_batch; they differ only in how one pin is opened/closed.
+    close_for = float(close_seconds) if close_seconds is not None else (pulse_ms / 1000.0)
 
     print("Probing pins (watch LEDs / listen for relay click). Ensure NOTHING is wired to the fireplace while probing.")
     for pin in pins:
         relay_name = _relay_name_for_pin(pin)
-        relay = Relay(RelayConfig(pin=pin, active_low=active_low), dry_run=dry_run)
-        close_for = float(close_seconds) if close_seconds is not None else (pulse_ms / 1000.0)
 
         # Fail-safe: ensure deactivated before any activation.
-        relay.open()
+        open_pin(pin)
         if open_seconds > 0:
             print(f"Pin {pin} ({relay_name}): {_red('OPEN-DEACTIVATE')} for {open_seconds:.2f}s")
             _sleep_with_sigint(open_seconds)
 
-        relay.close()
+        close_pin(pin)
         print(f"Pin {pin} ({relay_name}): {_green('CLOSE-ACTIVATE')} for {close_for:.2f}s")
         _sleep_with_sigint(close_for)
 
-        relay.open()
+        open_pin(pin)
         if post_open_seconds > 0:
             print(f"Pin {pin} ({relay_name}): {_red('OPEN-DEACTIVATE')} for {post_open_seconds:.2f}s")
             _sleep_with_sigint(post_open_seconds)
 
 
+def cmd_probe(
+    *,
+    pins: list[int],
+    active_low: bool,
+    pulse_ms: int,
+    open_seconds: float,
+    close_seconds: Optional[float],
+    post_open_seconds: float,
+    dry_run: bool,
+) -> None:
+    if not pins:
+        raise SystemExit("probe requires at least one pin")
+
+    # Claim every pin up-front (one Relay per distinct pin) so pin-factory setup happens once.
+    relays = {pin: Relay(RelayConfig(pin=pin, active_low=active_low), dry_run=dry_run) for pin in dict.fromkeys(pins)}
+    _run_probe_sequence(
+        pins,
+        open_pin=lambda pin: relays[pin].open(),
+        close_pin=lambda pin: relays[pin].close(),
+        pulse_ms=pulse_ms,
+        open_seconds=open_seconds,
+        close_seconds=close_seconds,
+        post_open_seconds=post_open_seconds,
+    )
+
+
+def cmd_probe_batch(
+    *,
+    pins: list[int],
+    active_low: bool,
+    pulse_ms: int,
+    open_seconds: float,
+    close_seconds: Optional[float],
+    post_open_seconds: float,
+    dry_run: bool,
+    chip_path: str = GPIOCHIP_PATH,
+) -> None:
+    # Same sequence as cmd_probe, driven through one GpiodRelayBank (opening always opens every pin).
+    if not pins:
+        raise SystemExit("probe requires at least one pin")
+
+    bank = GpiodRelayBank(list(dict.fromkeys(pins)), active_low=active_low, dry_run=dry_run, chip_path=chip_path)
+    try:
+        _run_probe_sequence(
+            pins,
+            open_pin=lambda _pin: bank.open(),
+            close_pin=bank.close_only,
+            pulse_ms=pulse_ms,
+            open_seconds=open_seconds,
+            close_seconds=close_seconds,
+            post_open_seconds=post_open_seconds,
+        )
+    finally:
+        bank.release()
+
+
 def _parse_pin(value: str) -> int:
     try:
         return int(value)
@@ -293,40 +587,40 @@ def _parse_pin(value: str) -> int:
         raise argparse.ArgumentTypeError("pin must be an integer GPIO (BCM numbering)") from e
 
 
-def build_parser() -> argparse.ArgumentParser:
+def _build_common_parser() -> argparse.ArgumentParser:
     common = argparse.ArgumentParser(add_help=False)
     common.add_argument(
         "--main-relay",
-        default=os.getenv("FIREPLACE_MAIN_RELAY"),
+        default=_ENV.main_relay,
         help=(
             "Main relay by name (e.g. low_flame) or BCM pin. Env: FIREPLACE_MAIN_RELAY. "
-            f"Known: {', '.join(sorted(KNOWN_RELAYS.keys()))}"
+            f"Known: {', '.join(_KNOWN_NAMES_SORTED)}"
         ),
     )
     common.add_argument(
         "--high-relay",
-        default=os.getenv("FIREPLACE_HIGH_RELAY"),
+        default=_ENV.high_relay,
         help=(
             "High-flame relay by name (e.g. high_flame) or BCM pin. Env: FIREPLACE_HIGH_RELAY. "
-            f"Known: {', '.join(sorted(KNOWN_RELAYS.keys()))}"
+            f"Known: {', '.join(_KNOWN_NAMES_SORTED)}"
         ),
     )
     common.add_argument(
         "--pin-main",
         type=_parse_pin,
-        default=os.getenv("FIREPLACE_PIN_MAIN"),
+        default=_ENV.pin_main,
         help="(Legacy) BCM GPIO pin for Main relay channel (COM=W, NO=R). Env: FIREPLACE_PIN_MAIN",
     )
     common.add_argument(
         "--pin-high",
         type=_parse_pin,
-        default=os.getenv("FIREPLACE_PIN_HIGH"),
+        default=_ENV.pin_high,
         help="(Legacy) BCM GPIO pin for High-flame relay channel (COM=W, NO=G). Env: FIREPLACE_PIN_HIGH",
     )
     common.add_argument(
         "--active-low",
         action="store_true",
-        default=(os.getenv("FIREPLACE_ACTIVE_LOW", "").strip().lower() in {"1", "true", "yes", "y"}),
+        default=_ENV.active_low,
         help=(
             "Set only if your relay turns ON when GPIO is LOW (inverted polarity). "
             "Env: FIREPLACE_ACTIVE_LOW=1"
@@ -341,27 +635,35 @@ def build_parser() -> argparse.ArgumentParser:
     common.add_argument(
         "--color",
         choices=["auto", "always", "never"],
-        default=os.getenv("FIREPLACE_COLOR", "auto"),
+        default=_ENV.color,
         help="Colorize output (auto uses TTY detection; env: FIREPLACE_COLOR; respects NO_COLOR)",
     )
+    common.add_argument(
+        "--pin-factory",
+        choices=sorted(PIN_FACTORIES),
+        default=_ENV.pin_factory,
+        help="gpiozero pin factory to drive GPIO with (default: gpiozero's choice). Env: FIREPLACE_PIN_FACTORY",
+    )
     common.add_argument(
         "--dry-run",
         action="store_true",
         help="Print actions instead of toggling GPIO",
     )
 
-    p = argparse.ArgumentParser(
-        prog="fireplace",
-        description="Heat & Glo IntelliFire IPI relay controller (momentary qualified closure)",
-        allow_abbrev=False,
-    )
+    return common
 
-    sub = p.add_subparsers(dest="cmd", required=True)
 
-    list_relays = sub.add_parser("list-relays", help="Show known relay names and their BCM pins")
+# Signature of argparse's subparsers `add_parser` (the action class itself is private).
+_AddParser = Callable[..., argparse.ArgumentParser]
+
+
+def _add_list_relays(add_parser: _AddParser) -> None:
+    list_relays = add_parser("list-relays", help="Show known relay names and their BCM pins")
     list_relays.add_argument("--json", action="store_true", help="Output JSON")
 
-    ignite = sub.add_parser("ignite", help="Momentary ignition request (qualified pulse)", parents=[common])
+
+def _add_ignite(add_parser: _AddParser, common: argparse.ArgumentParser) -> None:
+    ignite = add_parser("ignite", help="Momentary ignition request (qualified pulse)", parents=[common])
     ignite.add_argument("--pulse-ms", type=int, default=250, help="Pulse width in ms (default: 250)")
     ignite.add_argument(
         "--maintained",
@@ -375,20 +677,32 @@ def build_parser() -> argparse.ArgumentParser:
         help="How long to hold the call (default: forever until Ctrl+C)",
     )
 
-    on = sub.add_parser("on", help="Close and hold main relay (not recommended during detection window)", parents=[common])
+
+def _add_on(add_parser: _AddParser, common: argparse.ArgumentParser) -> None:
+    on = add_parser("on", help="Close and hold main relay (not recommended during detection window)", parents=[common])
     on.add_argument("--hold-seconds", type=float, default=None)
 
-    off = sub.add_parser("off", help="Open main relay", parents=[common])
 
-    high = sub.add_parser("high", help="Close and hold high-flame relay", parents=[common])
+def _add_off(add_parser: _AddParser, common: argparse.ArgumentParser) -> None:
+    add_parser("off", help="Open main relay", parents=[common])
+
+
+def _add_high(add_parser: _AddParser, common: argparse.ArgumentParser) -> None:
+    high = add_parser("high", help="Close and hold high-flame relay", parents=[common])
     high.add_argument("--hold-seconds", type=float, default=None)
 
-    low = sub.add_parser("low", help="Open high-flame relay", parents=[common])
 
-    pulse_high = sub.add_parser("pulse-high", help="Pulse high-flame relay (rare; usually use hold)", parents=[common])
+def _add_low(add_parser: _AddParser, common: argparse.ArgumentParser) -> None:
+    add_parser("low", help="Open high-flame relay", parents=[common])
+
+
+def _add_pulse_high(add_parser: _AddParser, common: argparse.ArgumentParser) -> None:
+    pulse_high = add_parser("pulse-high", help="Pulse high-flame relay (rare; usually use hold)", parents=[common])
     pulse_high.add_argument("--pulse-ms", type=int, default=250)
 
-    probe = sub.add_parser("probe", help="Probe GPIO pins to find which relay channel they drive", parents=[common])
+
+def _add_probe(add_parser: _AddParser, common: argparse.ArgumentParser) -> None:
+    probe = add_parser("probe", help="Probe GPIO pins to find which relay channel they drive", parents=[common])
     probe.add_argument(
         "--pins",
         default="4,22,6,26",
@@ -413,18 +727,68 @@ def build_parser() -> argparse.ArgumentParser:
         default=0.5,
         help="How long to stay OPEN-DEACTIVATE after the activation (default: 0.5)",
     )
+    probe.add_argument(
+        "--batch",
+        action="store_true",
+        help="Drive all pins through one libgpiod line request (one write per edge; needs python3-libgpiod)",
+    )
+    probe.add_argument(
+        "--gpiochip",
+        default=GPIOCHIP_PATH,
+        help=f"GPIO chip device for --batch (default: {GPIOCHIP_PATH})",
+    )
+
+
+# Builders receive the subparsers' add_parser; only those needing the shared
+# options also receive `common`.
+_SUBCOMMANDS: dict[str, Callable[[_AddParser, argparse.ArgumentParser], None]] = {
+    "ignite": _add_ignite,
+    "on": _add_on,
+    "off": _add_off,
+    "high": _add_high,
+    "low": _add_low,
+    "pulse-high": _add_pulse_high,
+    "probe": _add_probe,
+}
+
+# Subcommands driving the main (low_flame) relay vs. the high-flame relay.
+_MAIN_CMDS = frozenset({"ignite", "on", "off"})
+_HIGH_CMDS = frozenset({"high", "low", "pulse-high"})
+
+
+def build_parser(cmd: Optional[str] = None) -> argparse.ArgumentParser:
+    # When the subcommand is already known (argv[0]), build only its subparser; argparse
+    # construction dominates startup for a short-lived CLI. -h / unknown / None get everything.
+    p = argparse.ArgumentParser(
+        prog="fireplace",
+        description="Heat & Glo IntelliFire IPI relay controller (momentary qualified closure)",
+        allow_abbrev=False,
+    )
+
+    sub = p.add_subparsers(dest="cmd", required=True)
+    builder = _SUBCOMMANDS.get(cmd or "")
+    if builder is not None:
+        builder(sub.add_parser, _build_common_parser())
+    elif cmd == "list-relays":
+        _add_list_relays(sub.add_parser)
+    else:
+        _add_list_relays(sub.add_parser)
+        common = _build_common_parser()
+        for builder in _SUBCOMMANDS.values():
+            builder(sub.add_parser, common)
 
     return p
 
 
 def main(argv: list[str]) -> int:
-    args = build_parser().parse_args(argv)
+    args = build_parser(argv[0] if argv else None).parse_args(argv)
 
     global _COLOR_MODE
     if hasattr(args, "color"):
         _COLOR_MODE = str(getattr(args, "color"))
     else:
-        _COLOR_MODE = os.getenv("FIREPLACE_COLOR", "auto")
+        _COLOR_MODE = _ENV.color
+    _invalidate_color_cache()
 
     if args.cmd == "list-relays":
         if args.json:
@@ -433,7 +797,7 @@ def main(argv: list[str]) -> int:
             print(json.dumps(KNOWN_RELAYS, indent=2, sort_keys=True))
         else:
             print("Known relays (name -> BCM pin):")
-            for name in sorted(KNOWN_RELAYS.keys()):
+            for name in _KNOWN_NAMES_SORTED:
                 note = PHYSICAL_RELAY_NOTES.get(name)
                 if note:
                     print(f"- {name} -> {KNOWN_RELAYS[name]} ({note})")
@@ -442,9 +806,17 @@ def main(argv: list[str]) -> int:
             print("You can also pass a BCM pin directly (e.g. --main-relay 4).")
         return 0
 
+    # probe --batch drives libgpiod directly; only the gpiozero paths need a pin factory.
+    if not getattr(args, "dry_run", True) and not getattr(args, "batch", False):
+        try:
+            _use_pin_factory(args.pin_factory)
+        except ValueError as e:
+            # FIREPLACE_PIN_FACTORY reaches here unchecked (argparse skips choices for defaults).
+            raise SystemExit(str(e)) from e
+
     if args.cmd == "probe":
         pins = [p.strip() for p in str(args.pins).split(",") if p.strip()]
-        cmd_probe(
+        probe_args = dict(
             pins=[_parse_pin(p) for p in pins],
             active_low=bool(args.active_low),
             pulse_ms=int(args.pulse_ms),
@@ -453,13 +825,17 @@ def main(argv: list[str]) -> int:
             post_open_seconds=float(args.post_open_seconds),
             dry_run=bool(args.dry_run),
         )
+        if args.batch:
+            cmd_probe_batch(**probe_args, chip_path=str(args.gpiochip))
+        else:
+            cmd_probe(**probe_args)
         return 0
 
     main_pin = _resolve_relay_ref(args.main_relay) or _resolve_relay_ref(args.pin_main)
     high_pin = _resolve_relay_ref(args.high_relay) or _resolve_relay_ref(args.pin_high)
 
-    needs_main = args.cmd in {"ignite", "on", "off"}
-    needs_high = args.cmd in {"high", "low", "pulse-high"}
+    needs_main = args.cmd in _MAIN_CMDS
+    needs_high = args.cmd in _HIGH_CMDS
 
     main_relay = None
     if needs_main:
@@ -488,7 +864,7 @@ def main(argv: list[str]) -> int:
         high_relay.open()
 
     # Only apply the IPI boot guard for commands that interact with the fireplace call.
-    if args.cmd in {"ignite", "on", "off"}:
+    if args.cmd in _MAIN_CMDS:
         _guard_after_boot(float(args.boot_guard_seconds), dry_run=bool(args.dry_run))
 
     if args.cmd == "ignite":
@@ -509,7 +885,7 @@ def main(argv: list[str]) -> int:
         main_relay.open()
         return 0
 
-    if args.cmd in {"high", "low", "pulse-high"}:
+    if args.cmd in _HIGH_CMDS:
         assert high_relay is not None
 
         if args.cmd == "high":
@@ -526,8 +902,12 @@ def main(argv: list[str]) -> int:
 
 
 if __name__ == "__main__":
-    # Make Ctrl+C responsive even while sleeping.
-    signal.signal(signal.SIGINT, lambda *_: (_ for _ in ()).throw(KeyboardInterrupt()))
+    # Raise KeyboardInterrupt on Ctrl+C even if SIGINT was inherited as ignored (e.g. nohup / background
+    # jobs). time.sleep() is interrupted by it directly; no wakeup fd is needed.
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    # SIGTERM (e.g. the web UI's Stop) outside the hold-forever wait: exit via SystemExit so the
+    # atexit hook OPENs every relay.
+    signal.signal(signal.SIGTERM, lambda signum, _frame: sys.exit(128 + signum))
     try:
         raise SystemExit(main(sys.argv[1:]))
     except KeyboardInterrupt:
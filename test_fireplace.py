@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from unittest import mock
+
+import fireplace
+
+
+class FakeOutputDevice:
+    """Stand-in for gpiozero.OutputDevice that records every pin write."""
+
+    fail_next_write = False
+
+    def __init__(self, pin: int, *, active_high: bool, initial_value: bool) -> None:
+        self.pin = pin
+        self.value = initial_value
+        self.writes: list[bool] = []
+        self.closed = False
+
+    def _write(self, value: bool) -> None:
+        if FakeOutputDevice.fail_next_write:
+            FakeOutputDevice.fail_next_write = False
+            raise OSError("write failed")
+        self.value = value
+        self.writes.append(value)
+
+    def on(self) -> None:
+        self._write(True)
+
+    def off(self) -> None:
+        self._write(False)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class RelayWriteCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.object(fireplace, "_OutputDevice", FakeOutputDevice)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        FakeOutputDevice.fail_next_write = False
+        self.relay = fireplace.Relay(fireplace.RelayConfig(pin=4, active_low=False), dry_run=False)
+        self.addCleanup(fireplace._LIVE_RELAYS.discard, self.relay)
+        self.dev = self.relay._dev
+
+    def test_repeated_states_are_written_once(self) -> None:
+        self.relay.close()
+        self.relay.close()
+        self.relay.open()
+        self.relay.open()
+        self.assertEqual(self.dev.writes, [True, False])
+
+    def test_force_rewrites_an_open_relay(self) -> None:
+        self.relay.open()
+        self.relay.open(force=True)
+        self.assertEqual(self.dev.writes, [False, False])
+
+    def test_failed_write_does_not_update_the_cache(self) -> None:
+        self.relay.close()
+        FakeOutputDevice.fail_next_write = True
+        with self.assertRaises(OSError):
+            self.relay.open()
+        self.relay.open()
+        self.assertEqual(self.dev.writes, [True, False])
+        self.assertFalse(self.dev.value)
+
+    def test_release_forces_the_open(self) -> None:
+        self.relay.open()
+        self.dev.value = True  # pin changed behind the cache's back
+        self.relay.release()
+        self.assertFalse(self.dev.value)
+        self.assertTrue(self.dev.closed)
+        self.assertNotIn(self.relay, fireplace._LIVE_RELAYS)
+
+
+class SleepWithCancelTest(unittest.TestCase):
+    def test_long_cancellable_wait_is_chunked(self) -> None:
+        # 1e10 s is above threading.TIMEOUT_MAX; a single Event.wait would raise OverflowError.
+        cancel = threading.Event()
+        timer = threading.Timer(0.1, cancel.set)
+        timer.start()
+        self.addCleanup(timer.cancel)
+        started = time.monotonic()
+        with mock.patch.object(fireplace, "_SLEEP_CHUNK_SECONDS", 0.05):
+            fireplace._sleep_with_sigint(1e10, cancel=cancel)
+        self.assertLess(time.monotonic() - started, 2.0)
+
+    def test_cancelled_pulse_opens_the_relay(self) -> None:
+        relay = fireplace.Relay(fireplace.RelayConfig(pin=4, active_low=False), dry_run=True)
+        cancel = threading.Event()
+        cancel.set()
+        with mock.patch("builtins.print"):
+            fireplace.cmd_pulse(relay, pulse_ms=60_000, cancel=cancel)
+        self.assertIs(relay._last_state, False)
+
+
+if __name__ == "__main__":
+    unittest.main()
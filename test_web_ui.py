@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from typing import Callable
+from unittest import mock
+
+import fireplace
+from test_fireplace import FakeOutputDevice
+
+try:
+    import web_ui
+except ImportError:  # Flask is only in requirements-web.txt
+    web_ui = None  # type: ignore[assignment]
+
+
+def _wait_until(pred: Callable[[], bool], timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if pred():
+            return True
+        time.sleep(0.01)
+    return pred()
+
+
+@unittest.skipIf(web_ui is None, "flask is not installed")
+class InProcessHoldTest(unittest.TestCase):
+    def setUp(self) -> None:
+        patchers = [
+            mock.patch.object(fireplace, "_OutputDevice", FakeOutputDevice),
+            mock.patch.object(web_ui, "FIREPLACE_WEB_SUBPROCESS", False),
+            mock.patch.object(web_ui, "_relays", {}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        FakeOutputDevice.fail_next_write = False
+        self.addCleanup(self._reset)
+        self.client = web_ui.APP.test_client()
+
+    def _reset(self) -> None:
+        web_ui._stop_hold()
+        for relay in web_ui._relays.values():
+            fireplace._LIVE_RELAYS.discard(relay)
+        web_ui._last_result = None
+
+    def _post(self, action: str, **form: str) -> "web_ui.RunResult":
+        data = {"action": action, "boot_guard_seconds": "0", "pulse_ms": "10", "hold_seconds": "", **form}
+        self.client.post("/run", data=data)
+        assert web_ui._last_result is not None
+        return web_ui._last_result
+
+    def _hold_device(self) -> FakeOutputDevice:
+        self.assertTrue(_wait_until(lambda: web_ui._hold_relay is not None))
+        dev = web_ui._hold_relay._dev
+        self.assertTrue(_wait_until(lambda: dev.value is True))
+        return dev
+
+    def _hold_running(self) -> bool:
+        with web_ui._lock:
+            return web_ui._hold_running_locked()
+
+    def test_stop_opens_the_held_relay(self) -> None:
+        self._post("start_hold")
+        dev = self._hold_device()
+
+        result = self._post("stop")
+
+        self.assertIn("Stopped hold thread", result.output)
+        self.assertFalse(dev.value)
+        self.assertFalse(self._hold_running())
+
+    def test_ignite_and_off_refuse_while_holding(self) -> None:
+        self._post("start_hold")
+        dev = self._hold_device()
+
+        for active_low in ("", "on"):
+            result = self._post("ignite_pulse", active_low=active_low)
+            self.assertIn("a hold is running", result.output)
+            self.assertIsNone(result.exit_code)
+        result = web_ui._run_inproc(
+            "off", ["python3", "fireplace.py", "off"], lambda _cancel: web_ui._off_inproc(dry_run=False, active_low=True)
+        )
+        self.assertIn("a hold is running", result.output)
+
+        # The hold's relay was neither pulsed nor released.
+        self.assertTrue(dev.value)
+        self.assertFalse(dev.closed)
+        self.assertTrue(self._hold_running())
+
+    def test_second_start_hold_reports_busy(self) -> None:
+        self._post("start_hold")
+        self._hold_device()
+
+        result = self._post("start_hold")
+
+        self.assertEqual(result.output, "Hold process already running.")
+
+    def test_non_finite_hold_seconds_are_rejected(self) -> None:
+        result = self._post("start_hold", hold_seconds="inf")
+
+        self.assertIn("ERROR starting hold", result.output)
+        self.assertFalse(self._hold_running())
+
+    def test_hold_worker_error_opens_the_relay(self) -> None:
+        def failing_hold(relay: fireplace.Relay, **_kwargs: object) -> None:
+            relay.close()
+            raise RuntimeError("boom")
+
+        with mock.patch.object(fireplace, "cmd_hold", failing_hold):
+            self._post("start_hold")
+            self.assertTrue(_wait_until(lambda: not self._hold_running()))
+
+        dev = web_ui._relays[(4, False, False)]._dev
+        self.assertEqual(dev.writes[-2:], [True, False])
+        assert web_ui._last_result is not None
+        self.assertIn("ERROR: boom", web_ui._last_result.output)
+
+    def test_stop_preempts_an_inflight_pulse(self) -> None:
+        ignite = threading.Thread(target=self._post, args=("ignite_pulse",), kwargs={"pulse_ms": "60000"})
+        ignite.start()
+        self.assertTrue(_wait_until(lambda: (4, False, False) in web_ui._relays))
+        dev = web_ui._relays[(4, False, False)]._dev
+        self.assertTrue(_wait_until(lambda: dev.value is True))
+
+        started = time.monotonic()
+        self._post("stop")
+        ignite.join(timeout=2)
+
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertFalse(ignite.is_alive())
+        self.assertFalse(dev.value)
+
+    def test_inproc_runs_are_bounded(self) -> None:
+        result = web_ui._run_inproc(
+            "ignite_pulse",
+            ["python3", "fireplace.py", "ignite"],
+            lambda cancel: web_ui._ignite_inproc(
+                cancel, boot_guard_seconds="0", pulse_ms="60000", dry_run=False, active_low=False
+            ),
+            timeout=0.1,
+        )
+
+        self.assertIsNone(result.exit_code)
+        self.assertIn("timed out", result.output)
+        self.assertFalse(web_ui._relays[(4, False, False)]._dev.value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,10 @@ PY="${FIREPLACE_WEB_PYTHON:-/home/gbrill/.venv/bin/python}"
 HOST="${FIREPLACE_WEB_HOST:-127.0.0.1}"
 PORT="${FIREPLACE_WEB_PORT:-8080}"
 SUDO="${FIREPLACE_WEB_SUDO:-0}"
+# web_ui.py drives GPIO in-process, so $PY itself needs gpiozero and a pin-factory backend.
+# If it is a venv without them, set FIREPLACE_WEB_SUBPROCESS=1 to run each action with
+# FIREPLACE_CLI_PYTHON (default: system python3) instead.
+SUBPROCESS="${FIREPLACE_WEB_SUBPROCESS:-}"
 
 PIDFILE=".web_ui.pid"
 LOGFILE=".web_ui.log"
@@ -32,7 +36,7 @@ fi
 # Note: GPIO access may require sudo depending on your Pi setup.
 cmd=("$PY" "web_ui.py")
 
-env FIREPLACE_WEB_HOST="$HOST" FIREPLACE_WEB_PORT="$PORT" \
+env FIREPLACE_WEB_HOST="$HOST" FIREPLACE_WEB_PORT="$PORT" FIREPLACE_WEB_SUBPROCESS="$SUBPROCESS" \
   bash -c "
     set -e
     if [[ '$SUDO' == '1' ]]; then
@@ -1,16 +1,27 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import codecs
+import contextlib
+import io
+import math
 import os
+import select
 import shlex
+import signal
 import subprocess
 import sys
 import threading
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Iterator, Optional
 
-from flask import Flask, redirect, render_template_string, request, url_for
+from flask import Flask, Response, redirect, request, url_for
+
+
+import fireplace
 
 
 APP = Flask(__name__)
@@ -18,6 +29,9 @@ APP = Flask(__name__)
 
 FIREPLACE_PY = os.path.join(os.path.dirname(__file__), "fireplace.py")
 FIREPLACE_CLI_PYTHON = os.getenv("FIREPLACE_CLI_PYTHON", "python3")
+# Escape hatch: run fireplace.py as a child process per action (e.g. when this
+# server's Python lacks GPIO pin-factory backends but FIREPLACE_CLI_PYTHON has them).
+FIREPLACE_WEB_SUBPROCESS = os.getenv("FIREPLACE_WEB_SUBPROCESS", "").strip().lower() in fireplace._TRUTHY
 
 
 @dataclass
@@ -33,6 +47,16 @@ _lock = threading.Lock()
 _last_result: Optional[RunResult] = None
 _hold_proc: Optional[subprocess.Popen[str]] = None
 _hold_cmd: Optional[str] = None
+_hold_thread: Optional[threading.Thread] = None
+_hold_cancel: Optional[threading.Event] = None
+_hold_relay: Optional[fireplace.Relay] = None
+
+# Serializes in-process runs that drive GPIO and the _relays cache. Lock order: _run_lock, then _lock.
+_run_lock = threading.Lock()
+_relays: dict[tuple[int, bool, bool], fireplace.Relay] = {}
+# Cancel events of in-process runs that are running or queued on _run_lock (guarded by _lock).
+# Stop sets them so it never waits out a pulse or boot guard before opening the relay.
+_run_cancels: set[threading.Event] = set()
 
 
 HTML = """
@@ -105,11 +129,27 @@ HTML = """
         <div class="small">No commands run yet.</div>
       {% endif %}
     </div>
+
+    <div class="card" style="flex: 1 1 100%;">
+      <h2>Live Output</h2>
+      <pre class="mono" id="live"></pre>
+    </div>
   </div>
+  <script>
+    // Output of the running action, streamed while the form POST is still pending.
+    const live = document.getElementById("live");
+    const events = new EventSource("{{ url_for('stream') }}");
+    events.addEventListener("reset", () => { live.textContent = ""; });
+    events.onmessage = (e) => { live.textContent += e.data + "\n"; };
+  </script>
 </body>
 </html>
 """
 
+# Compiled once. Flask's jinja_env (unlike a bare jinja2.Template) keeps autoescaping
+# for string templates and provides url_for.
+_TEMPLATE = APP.jinja_env.from_string(HTML)
+
 
 def _build_base_args() -> list[str]:
     # IMPORTANT: default to system python for GPIO access.
@@ -131,66 +171,526 @@ def _add_common_after_subcommand(
     return argv
 
 
-def _cli_env() -> dict[str, str]:
-    env = dict(os.environ)
-    # Keep CLI colors off for captured output (web view).
-    env["FIREPLACE_COLOR"] = "never"
-    env["NO_COLOR"] = "1"
-    return env
+# Display-only quoting; argv tokens (interpreter, script path, flags, relay names) repeat across clicks.
+_quote = lru_cache(maxsize=256)(shlex.quote)
+
+
+class _LiveOutput:
+    """Output of the most recent action, line by line, for the /stream endpoint."""
+
+    def __init__(self, maxlen: int = 1000) -> None:
+        # Own condition rather than _lock: writers may run while _lock is held (e.g. Stop joining a hold).
+        self._cond = threading.Condition()
+        self._lines: deque[tuple[int, str]] = deque(maxlen=maxlen)
+        self._seq = 0
+        self._run = 0
+        self._partial = ""
+
+    def begin(self, command: str) -> None:
+        with self._cond:
+            self._run += 1
+            self._lines.clear()
+            self._partial = ""
+            self._append_locked(f"$ {command}")
+            self._cond.notify_all()
+
+    def write(self, text: str) -> None:
+        with self._cond:
+            *done, self._partial = (self._partial + text).split("\n")
+            for line in done:
+                self._append_locked(line)
+            if done:
+                self._cond.notify_all()
+
+    def flush(self) -> None:
+        # Emit a trailing line that had no newline.
+        with self._cond:
+            if self._partial:
+                self._append_locked(self._partial)
+                self._partial = ""
+                self._cond.notify_all()
+
+    def _append_locked(self, line: str) -> None:
+        self._seq += 1
+        self._lines.append((self._seq, line))
+
+    def wait_since(self, run: int, seq: int, timeout: float) -> tuple[int, int, bool, list[str]]:
+        # Returns (run, seq, reset, lines); `reset` means a new action started since `run`.
+        with self._cond:
+            self._cond.wait_for(lambda: self._run != run or self._seq > seq, timeout=timeout)
+            reset = self._run != run
+            lines = [line for n, line in self._lines if reset or n > seq]
+            return self._run, self._seq, reset, lines
+
+
+_live = _LiveOutput()
+
+
+class _LiveStringIO(io.StringIO):
+    # _stdout.redirect target that also feeds _live.
+    def write(self, s: str) -> int:
+        _live.write(s)
+        return super().write(s)
+
+
+class _ThreadStdout(io.TextIOBase):
+    """sys.stdout stand-in that sends each thread's prints to its own target.
+
+    The hold worker prints while other actions run, so a process-wide
+    contextlib.redirect_stdout would mix their output.
+    """
+
+    def __init__(self, default: io.TextIOBase) -> None:
+        self._default = default
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def redirect(self, target: io.TextIOBase) -> Iterator[None]:
+        prev = getattr(self._local, "target", None)
+        self._local.target = target
+        try:
+            yield
+        finally:
+            self._local.target = prev
+
+    def _target(self) -> io.TextIOBase:
+        target = getattr(self._local, "target", None)
+        return self._default if target is None else target
+
+    @property
+    def encoding(self) -> str:  # type: ignore[override]
+        return self._default.encoding
+
+    def isatty(self) -> bool:
+        return self._target().isatty()
+
+    def fileno(self) -> int:
+        return self._default.fileno()
 
+    def write(self, s: str) -> int:
+        return self._target().write(s)
 
-def _run_sync(action: str, argv: list[str]) -> RunResult:
+    def flush(self) -> None:
+        self._target().flush()
+
+
+_stdout = _ThreadStdout(sys.stdout)  # type: ignore[arg-type]
+
+
+def _configure_process() -> None:
+    # Process-wide setup for serving, done by main() rather than at import. Idempotent.
+    # Keep CLI colors off for captured output (web view): in-process via fireplace's
+    # color mode, and for subprocesses (which inherit os.environ) via the environment.
+    fireplace._COLOR_MODE = "never"
+    fireplace._invalidate_color_cache()
+    os.environ["FIREPLACE_COLOR"] = "never"
+    os.environ["NO_COLOR"] = "1"
+    # A child writing to a pipe block-buffers stdout; unbuffered, its lines reach /stream as printed.
+    os.environ["PYTHONUNBUFFERED"] = "1"
+    # In-process actions and the hold thread print through _stdout.redirect.
+    sys.stdout = _stdout
+
+
+def _run_sync(action: str, argv: list[str], timeout: float = 60.0) -> RunResult:
     started = time.time()
-    cmd_str = " ".join(shlex.quote(a) for a in argv)
+    cmd_str = " ".join(_quote(a) for a in argv)
     try:
-        cp = subprocess.run(argv, capture_output=True, text=True, timeout=60, env=_cli_env())
-        out = (cp.stdout or "") + (cp.stderr or "")
-        return RunResult(when=started, action=action, command=cmd_str, exit_code=cp.returncode, output=out.strip())
+        proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
     except Exception as e:
         return RunResult(when=started, action=action, command=cmd_str, exit_code=None, output=f"ERROR: {e}")
 
+    # Read output as it arrives (select + os.read on a ready fd never blocks) so /stream
+    # can show progress during e.g. the boot-guard wait.
+    _live.begin(cmd_str)
+    assert proc.stdout is not None
+    fd = proc.stdout.fileno()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    chunks: list[str] = []
+    deadline = time.monotonic() + timeout
+    timed_out = False
+    with proc:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                proc.kill()
+                break
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            data = os.read(fd, 4096)
+            if not data:
+                break
+            text = decoder.decode(data)
+            chunks.append(text)
+            _live.write(text)
+        tail = decoder.decode(b"", final=True)
+        chunks.append(tail)
+        _live.write(tail)
+        _live.flush()
+        proc.wait()
+
+    out = "".join(chunks).strip()
+    if timed_out:
+        out = (out + f"\nERROR: timed out after {timeout:g}s").strip()
+        return RunResult(when=started, action=action, command=cmd_str, exit_code=None, output=out)
+    return RunResult(when=started, action=action, command=cmd_str, exit_code=proc.returncode, output=out)
+
+
+def _inproc_command(argv: list[str]) -> str:
+    # Show the equivalent CLI invocation (minus the interpreter) for the UI.
+    return "(in-process) " + " ".join(_quote(a) for a in argv[1:])
+
+
+def _parse_boot_guard(boot_guard_seconds: str) -> float:
+    # Blank means fireplace.py's own default.
+    if boot_guard_seconds.strip() == "":
+        return 12.0
+    return float(boot_guard_seconds)
+
+
+def _live_hold_relay() -> Optional[fireplace.Relay]:
+    # The relay a running in-process hold is driving, if any.
+    with _lock:
+        if _hold_thread is not None and _hold_thread.is_alive():
+            return _hold_relay
+        return None
+
+
+def _refuse_during_hold() -> None:
+    # In-process ignite/off share the hold's cached Relay; driving it would end the hold behind its back.
+    with _lock:
+        if _hold_running_locked():
+            raise RuntimeError("a hold is running; Stop it first")
+
+
+def _get_relay_locked(*, active_low: bool, dry_run: bool) -> fireplace.Relay:
+    # Must hold _run_lock. Relays are cached per (pin, active_low, dry_run);
+    # gpiozero only lets one device own a pin, so drop stale real-GPIO entries first.
+    pin = fireplace.KNOWN_RELAYS["low_flame"]
+    key = (pin, active_low, dry_run)
+    relay = _relays.get(key)
+    if relay is None:
+        if not dry_run:
+            held = _live_hold_relay()
+            stale_keys = [k for k in _relays if k[0] == pin and not k[2]]
+            if held is not None and any(_relays[k] is held for k in stale_keys):
+                raise RuntimeError("low_flame is driven by the running hold; Stop it first")
+            fireplace._use_pin_factory(fireplace._ENV.pin_factory)
+            for stale in stale_keys:
+                _relays.pop(stale).release()
+        relay = fireplace.Relay(fireplace.RelayConfig(pin=pin, active_low=active_low), dry_run=dry_run)
+        _relays[key] = relay
+    return relay
+
+
+def _cancel_inproc_runs() -> None:
+    with _lock:
+        for cancel in _run_cancels:
+            cancel.set()
 
-def _stop_hold_locked() -> RunResult:
-    global _hold_proc, _hold_cmd
 
+def _run_inproc(
+    action: str, argv: list[str], fn: Callable[[threading.Event], None], timeout: float = 60.0
+) -> RunResult:
+    # `fn` must return promptly once its event is set: by Stop, or after `timeout` (the bound the
+    # subprocess path gets from _run_sync).
     started = time.time()
-    if _hold_proc is None or _hold_proc.poll() is not None:
-        _hold_proc = None
-        _hold_cmd = None
-        return RunResult(when=started, action="stop", command="(no hold process)", exit_code=0, output="Hold process was not running.")
+    cmd_str = _inproc_command(argv)
+    buf = _LiveStringIO()
+    exit_code: Optional[int] = 0
+    cancel = threading.Event()
+    expired = threading.Event()
+
+    def expire() -> None:
+        expired.set()
+        cancel.set()
+
+    timer = threading.Timer(timeout, expire)
+    with _lock:
+        _run_cancels.add(cancel)
+    try:
+        with _run_lock:
+            _live.begin(cmd_str)
+            timer.start()
+            try:
+                if not cancel.is_set():
+                    with _stdout.redirect(buf):
+                        fn(cancel)
+            except SystemExit as e:
+                # fireplace.py reports usage errors as SystemExit(message).
+                if isinstance(e.code, int):
+                    exit_code = e.code
+                else:
+                    exit_code = 1
+                    buf.write(f"{e.code}\n")
+            except Exception as e:
+                exit_code = None
+                buf.write(f"ERROR: {e}\n")
+            finally:
+                timer.cancel()
+            if expired.is_set():
+                exit_code = None
+                buf.write(f"ERROR: timed out after {timeout:g}s\n")
+            elif cancel.is_set():
+                # Same exit code as the CLI on Ctrl+C.
+                exit_code = 130
+                buf.write("Interrupted by Stop\n")
+            _live.flush()
+    finally:
+        with _lock:
+            _run_cancels.discard(cancel)
+    return RunResult(when=started, action=action, command=cmd_str, exit_code=exit_code, output=buf.getvalue().strip())
+
+
+def _ignite_inproc(
+    cancel: threading.Event, *, boot_guard_seconds: str, pulse_ms: str, dry_run: bool, active_low: bool
+) -> None:
+    guard = _parse_boot_guard(boot_guard_seconds)
+    width = int(pulse_ms)
+    _refuse_during_hold()
+    relay = _get_relay_locked(active_low=active_low, dry_run=dry_run)
+    # Same sequence as `fireplace.py ignite`: fail-safe OPEN, boot guard, pulse. The relay is
+    # cached across requests, so force the OPEN rather than trust its last-written state.
+    relay.open(force=True)
+    fireplace._guard_after_boot(guard, dry_run=dry_run, cancel=cancel)
+    if not cancel.is_set():
+        fireplace.cmd_pulse(relay, pulse_ms=width, cancel=cancel)
+
+
+def _off_inproc(*, dry_run: bool, active_low: bool) -> None:
+    _refuse_during_hold()
+    _get_relay_locked(active_low=active_low, dry_run=dry_run).open(force=True)
+
+
+def _hold_inproc(
+    cancel: threading.Event, *, guard: float, hold_for: Optional[float], dry_run: bool, active_low: bool
+) -> None:
+    # Runs on the hold thread, which is registered before it starts: in-process ignite/off
+    # refuse from then on, so the relay resolved here cannot be released under the hold.
+    global _hold_relay
+
+    with _run_lock:
+        if cancel.is_set():
+            return
+        relay = _get_relay_locked(active_low=active_low, dry_run=dry_run)
+        with _lock:
+            _hold_relay = relay
+    # Same sequence as `fireplace.py on`, but Stop sets `cancel` instead of sending a signal.
+    try:
+        relay.open(force=True)
+        fireplace._guard_after_boot(guard, dry_run=dry_run, cancel=cancel)
+        if not cancel.is_set():
+            fireplace.cmd_hold(relay, hold_seconds=hold_for, cancel=cancel)
+    finally:
+        # Whatever ended the hold, never leave the relay energized.
+        relay.open(force=True)
+
+
+def _prepare_hold_thread(
+    argv: list[str], *, boot_guard_seconds: str, hold_seconds: str, dry_run: bool, active_low: bool
+) -> tuple[RunResult, Optional[threading.Thread], Optional[threading.Event]]:
+    # Builds (but does not start) the hold worker; the caller registers and starts it under _lock.
+    cmd_str = _inproc_command(argv)
+    try:
+        guard = _parse_boot_guard(boot_guard_seconds)
+        hold_for = float(hold_seconds) if hold_seconds != "" else None
+        if hold_for is not None and not math.isfinite(hold_for):
+            raise ValueError(f"hold seconds must be a finite number, got {hold_seconds!r}")
+    except Exception as e:
+        return (
+            RunResult(
+                when=time.time(),
+                action="start_hold",
+                command=cmd_str,
+                exit_code=None,
+                output=f"ERROR starting hold: {e}",
+            ),
+            None,
+            None,
+        )
+
+    cancel = threading.Event()
+
+    def worker() -> None:
+        global _last_result
+
+        _live.begin(cmd_str)
+        buf = _LiveStringIO()
+        try:
+            with _stdout.redirect(buf):
+                _hold_inproc(cancel, guard=guard, hold_for=hold_for, dry_run=dry_run, active_low=active_low)
+        except Exception as e:
+            # The request that started the hold has already returned; report through the page.
+            buf.write(f"ERROR: {e}\n")
+            with _lock:
+                _last_result = RunResult(
+                    when=time.time(),
+                    action="start_hold",
+                    command=cmd_str,
+                    exit_code=None,
+                    output=buf.getvalue().strip(),
+                )
+        finally:
+            _live.flush()
+
+    thread = threading.Thread(target=worker, name="fireplace-hold", daemon=True)
+    result = RunResult(
+        when=time.time(),
+        action="start_hold",
+        command=cmd_str,
+        exit_code=None,
+        output="Started hold thread. Use Stop to open the relay.",
+    )
+    return result, thread, cancel
 
-    proc = _hold_proc
-    cmd = _hold_cmd or "(unknown)"
 
+def _spawn_hold_proc(argv: list[str]) -> tuple[RunResult, Optional[subprocess.Popen[str]]]:
+    cmd_str = " ".join(_quote(a) for a in argv)
+    try:
+        proc = subprocess.Popen(
+            argv,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+    except Exception as e:
+        return (
+            RunResult(
+                when=time.time(),
+                action="start_hold",
+                command=cmd_str,
+                exit_code=None,
+                output=f"ERROR starting hold: {e}",
+            ),
+            None,
+        )
+    # Drain the pipe into /stream for the life of the process; unread, a chatty child would
+    # block once the pipe buffer fills.
+    _live.begin(cmd_str)
+    threading.Thread(target=_drain_to_live, args=(proc,), name="fireplace-hold-output", daemon=True).start()
+    result = RunResult(
+        when=time.time(),
+        action="start_hold",
+        command=cmd_str,
+        exit_code=None,
+        output="Started hold process. Use Stop to open the relay.",
+    )
+    return result, proc
+
+
+def _drain_to_live(proc: subprocess.Popen[str]) -> None:
+    assert proc.stdout is not None
+    with proc.stdout:
+        for line in proc.stdout:
+            _live.write(line)
+    _live.flush()
+
+
+def _hold_busy_locked() -> Optional[RunResult]:
+    if not _hold_running_locked():
+        return None
+    return RunResult(
+        when=time.time(),
+        action="start_hold",
+        command=_hold_cmd or "(unknown)",
+        exit_code=0,
+        output="Hold process already running.",
+    )
+
+
+def _hold_running_locked() -> bool:
+    if _hold_proc is not None and _hold_proc.poll() is None:
+        return True
+    return _hold_thread is not None and _hold_thread.is_alive()
+
+
+def _stop_hold() -> tuple[RunResult, bool]:
+    # Returns (result, released): `released` is True only when a running hold was stopped and
+    # opened the relay itself (thread finished, or the CLI exited on SIGTERM rather than SIGKILL).
+    # _lock is held only to read and clear the handles, never across the join/wait. The hold
+    # stays registered meanwhile, so ignite/off keep refusing and Start Hold reports it busy.
+    global _hold_proc, _hold_cmd, _hold_thread, _hold_cancel, _hold_relay
+
+    started = time.time()
+    with _lock:
+        if not _hold_running_locked():
+            _hold_proc = None
+            _hold_cmd = None
+            _hold_thread = None
+            _hold_cancel = None
+            _hold_relay = None
+            return (
+                RunResult(when=started, action="stop", command="(no hold process)", exit_code=0, output="Hold process was not running."),
+                False,
+            )
+        thread = _hold_thread
+        proc = _hold_proc
+        cmd = _hold_cmd or "(unknown)"
+        if _hold_cancel is not None:
+            _hold_cancel.set()
+
+    if thread is not None:
+        thread.join(timeout=5)
+        released = not thread.is_alive()
+
+        # A thread that is still alive keeps its registration, so the UI shows it
+        # and in-process ignite/off keep refusing to touch its relay.
+        with _lock:
+            if released and _hold_thread is thread:
+                _hold_thread = None
+                _hold_cancel = None
+                _hold_cmd = None
+                _hold_relay = None
+
+        return (
+            RunResult(
+                when=started,
+                action="stop",
+                command=cmd,
+                exit_code=0,
+                output="Stopped hold thread (relay opened)." if released else "Hold thread did not stop within 5s.",
+            ),
+            released,
+        )
+
+    # fireplace.py OPENs the relay on SIGTERM before exiting; SIGKILL is only a last resort.
+    released = True
+    assert proc is not None
     proc.terminate()
     try:
         proc.wait(timeout=5)
     except subprocess.TimeoutExpired:
+        released = False
         proc.kill()
         proc.wait(timeout=5)
 
-    _hold_proc = None
-    _hold_cmd = None
-
-    return RunResult(
-        when=started,
-        action="stop",
-        command=cmd,
-        exit_code=0,
-        output="Stopped hold process (sent terminate/kill as needed).",
+    with _lock:
+        if _hold_proc is proc:
+            _hold_proc = None
+            _hold_cmd = None
+
+    return (
+        RunResult(
+            when=started,
+            action="stop",
+            command=cmd,
+            exit_code=0,
+            output="Stopped hold process (sent terminate/kill as needed).",
+        ),
+        released,
     )
 
 
 @APP.get("/")
 def index():
     with _lock:
-        hold_running = _hold_proc is not None and _hold_proc.poll() is None
+        hold_running = _hold_running_locked()
         hold_cmd = _hold_cmd
         last = _last_result
 
     # Defaults chosen for safety and convenience.
-    return render_template_string(
-        HTML,
+    return _TEMPLATE.render(
         boot_guard_seconds=request.args.get("boot_guard_seconds", "12"),
         pulse_ms=request.args.get("pulse_ms", "250"),
         hold_seconds=request.args.get("hold_seconds", ""),
@@ -202,9 +702,46 @@ def index():
     )
 
 
+# Each /stream response ends after _STREAM_SECONDS and the EventSource reconnects (resuming via
+# Last-Event-ID), so a page that was navigated away from frees its server thread. The short
+# keepalive makes the server notice a closed connection quickly in the meantime.
+_STREAM_SECONDS = 30.0
+_STREAM_KEEPALIVE_SECONDS = 2.0
+
+
+def _parse_event_id(value: Optional[str]) -> tuple[int, int]:
+    # Event ids are "run:seq"; anything else replays the current action from the start.
+    try:
+        run, seq = (value or "").split(":")
+        return int(run), int(seq)
+    except ValueError:
+        return 0, 0
+
+
+@APP.get("/stream")
+def stream():
+    # Server-sent events: "reset" when a new action starts, then one message per output line.
+    run, seq = _parse_event_id(request.headers.get("Last-Event-ID"))
+
+    def events(run: int, seq: int) -> Iterator[str]:
+        yield "retry: 1000\n\n"
+        deadline = time.monotonic() + _STREAM_SECONDS
+        while time.monotonic() < deadline:
+            run, seq, reset, lines = _live.wait_since(run, seq, timeout=_STREAM_KEEPALIVE_SECONDS)
+            messages = ["event: reset\ndata:"] if reset else []
+            messages += [f"data: {line}" for line in lines]
+            if not messages:
+                yield ": keepalive\n\n"
+                continue
+            messages[-1] = f"id: {run}:{seq}\n{messages[-1]}"
+            yield "".join(m + "\n\n" for m in messages)
+
+    return Response(events(run, seq), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
 @APP.post("/run")
 def run_action():
-    global _last_result, _hold_proc, _hold_cmd
+    global _last_result, _hold_proc, _hold_cmd, _hold_thread, _hold_cancel
 
     action = (request.form.get("action") or "").strip()
     boot_guard_seconds = request.form.get("boot_guard_seconds", "12")
@@ -219,78 +756,102 @@ def run_action():
             argv, boot_guard_seconds=boot_guard_seconds, dry_run=dry_run, active_low=active_low
         )
         argv += ["--main-relay", "low_flame", "--pulse-ms", pulse_ms]
-        result = _run_sync("ignite_pulse", argv)
+        if FIREPLACE_WEB_SUBPROCESS:
+            result = _run_sync("ignite_pulse", argv)
+        else:
+            result = _run_inproc(
+                "ignite_pulse",
+                argv,
+                lambda cancel: _ignite_inproc(
+                    cancel,
+                    boot_guard_seconds=boot_guard_seconds, pulse_ms=pulse_ms, dry_run=dry_run, active_low=active_low
+                ),
+            )
         with _lock:
             _last_result = result
 
     elif action == "start_hold":
         with _lock:
             # If already running, do nothing.
-            if _hold_proc is not None and _hold_proc.poll() is None:
-                _last_result = RunResult(
-                    when=time.time(),
-                    action="start_hold",
-                    command=_hold_cmd or "(unknown)",
-                    exit_code=0,
-                    output="Hold process already running.",
-                )
+            busy = _hold_busy_locked()
+            if busy is not None:
+                _last_result = busy
+
+        if busy is None:
+            argv = _build_base_args() + ["on"]
+            argv = _add_common_after_subcommand(
+                argv, boot_guard_seconds=boot_guard_seconds, dry_run=dry_run, active_low=active_low
+            )
+            argv += ["--main-relay", "low_flame"]
+            if hold_seconds != "":
+                argv += ["--hold-seconds", hold_seconds]
+
+            # Spawn / set up GPIO outside _lock (both can take milliseconds), then commit.
+            proc: Optional[subprocess.Popen[str]] = None
+            thread: Optional[threading.Thread] = None
+            cancel: Optional[threading.Event] = None
+            if FIREPLACE_WEB_SUBPROCESS:
+                result, proc = _spawn_hold_proc(argv)
             else:
-                argv = _build_base_args() + ["on"]
-                argv = _add_common_after_subcommand(
-                    argv, boot_guard_seconds=boot_guard_seconds, dry_run=dry_run, active_low=active_low
+                result, thread, cancel = _prepare_hold_thread(
+                    argv,
+                    boot_guard_seconds=boot_guard_seconds,
+                    hold_seconds=hold_seconds,
+                    dry_run=dry_run,
+                    active_low=active_low,
                 )
-                argv += ["--main-relay", "low_flame"]
-                if hold_seconds != "":
-                    argv += ["--hold-seconds", hold_seconds]
 
-                cmd_str = " ".join(shlex.quote(a) for a in argv)
+            with _lock:
+                busy = _hold_busy_locked()
+                if busy is not None:
+                    # A concurrent Start Hold committed first; keep theirs.
+                    _last_result = busy
+                else:
+                    if proc is not None:
+                        _hold_proc = proc
+                        _hold_cmd = result.command
+                    if thread is not None:
+                        _hold_thread = thread
+                        _hold_cancel = cancel
+                        _hold_cmd = result.command
+                        thread.start()
+                    _last_result = result
+
+            if busy is not None and proc is not None:
+                proc.terminate()
                 try:
-                    _hold_proc = subprocess.Popen(
-                        argv,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        text=True,
-                        env=_cli_env(),
-                    )
-                    _hold_cmd = cmd_str
-                    _last_result = RunResult(
-                        when=time.time(),
-                        action="start_hold",
-                        command=cmd_str,
-                        exit_code=None,
-                        output="Started hold process. Use Stop to open the relay.",
-                    )
-                except Exception as e:
-                    _hold_proc = None
-                    _hold_cmd = None
-                    _last_result = RunResult(
-                        when=time.time(),
-                        action="start_hold",
-                        command=cmd_str,
-                        exit_code=None,
-                        output=f"ERROR starting hold: {e}",
-                    )
+                    proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.wait(timeout=5)
 
     elif action == "stop":
+        # Cut short any in-process ignite first; its pulse/boot guard OPENs the relay as it returns.
+        _cancel_inproc_runs()
+        result, released = _stop_hold()
         with _lock:
-            result = _stop_hold_locked()
             _last_result = result
 
-        # Also ensure we actively open the relay via CLI (belt + suspenders).
-        argv = _build_base_args() + ["off"]
-        argv = _add_common_after_subcommand(
-            argv, boot_guard_seconds=boot_guard_seconds, dry_run=dry_run, active_low=active_low
-        )
-        argv += ["--main-relay", "low_flame"]
-        sync = _run_sync("off", argv)
-        with _lock:
-            _last_result = RunResult(
-                when=time.time(),
-                action="stop",
-                command=f"{result.command}\n{sync.command}",
-                exit_code=sync.exit_code,
-                output=(result.output + "\n" + (sync.output or "")).strip(),
+        # The hold opens the relay itself when stopped cleanly. Otherwise (nothing was running,
+        # or it had to be killed) actively open it (belt + suspenders).
+        if not released:
+            argv = _build_base_args() + ["off"]
+            argv = _add_common_after_subcommand(
+                argv, boot_guard_seconds=boot_guard_seconds, dry_run=dry_run, active_low=active_low
             )
+            argv += ["--main-relay", "low_flame"]
+            if FIREPLACE_WEB_SUBPROCESS:
+                sync = _run_sync("off", argv)
+            else:
+                sync = _run_inproc("off", argv, lambda _cancel: _off_inproc(dry_run=dry_run, active_low=active_low))
+            with _lock:
+                _last_result = RunResult(
+                    when=time.time(),
+                    action="stop",
+                    command=f"{result.command}\n{sync.command}",
+                    exit_code=sync.exit_code,
+                    output=(result.output + "\n" + (sync.output or "")).strip(),
+                )
 
     else:
         with _lock:
@@ -310,9 +871,26 @@ def run_action():
 
 
 def main() -> int:
+    _configure_process()
     host = os.getenv("FIREPLACE_WEB_HOST", "127.0.0.1")
     port = int(os.getenv("FIREPLACE_WEB_PORT", "8080"))
-    debug = os.getenv("FIREPLACE_WEB_DEBUG", "").strip().lower() in {"1", "true", "yes", "y"}
+    debug = os.getenv("FIREPLACE_WEB_DEBUG", "").strip().lower() in fireplace._TRUTHY
+    # waitress (if installed) avoids the Flask dev server's per-request overhead and warning.
+    # "flask" or FIREPLACE_WEB_DEBUG=1 keeps the dev server (debugger/reloader).
+    server = os.getenv("FIREPLACE_WEB_SERVER", "waitress").strip().lower()
+    # In-process holds own the GPIO here, so a plain `kill` (web_stop.sh) must exit via SystemExit
+    # for fireplace's atexit hook to OPEN every relay, as the CLI does.
+    signal.signal(signal.SIGTERM, lambda signum, _frame: sys.exit(128 + signum))
+
+    if server == "waitress" and not debug:
+        try:
+            from waitress import serve  # type: ignore
+        except ImportError:
+            print("waitress not installed; falling back to the Flask dev server", file=sys.stderr)
+        else:
+            # Each open page keeps one /stream connection (and thus one thread) busy; see _STREAM_SECONDS.
+            serve(APP, host=host, port=port, threads=8)
+            return 0
 
     APP.run(host=host, port=port, debug=debug)
     return 0